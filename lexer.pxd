@@ -0,0 +1,76 @@
+# cython: language_level=3
+#
+# lexer.py 的 Cython 类型声明 (augmenting .pxd)
+# [说明] lexer.py 仍是唯一的源代码，可以直接用 python 运行。
+# 用 Cython 编译时 (见 setup.py)，Cython 会自动读取同名的 .pxd，
+# 把 Lexer 编译成 cdef class，并按这里的声明给字段、热点函数的局部变量加上 C 类型，
+# 使 "逐字符扫描" 的主循环变成 C 层面的整数下标循环。
+# 修改 Lexer 的字段或下列方法的签名时，需要同步修改本文件。
+
+cimport cython
+
+
+cdef class Lexer:
+    cdef public unicode src
+    cdef public bytes src_b
+    cdef public Py_ssize_t pos
+    cdef public Py_ssize_t _ntok
+    cdef public list line_starts
+    cdef public object tok_code
+    cdef public list tok_value
+    cdef public object tok_attr
+    cdef public object tok_line
+    cdef public object tok_col
+    cdef public object tokens
+    cdef public list errors
+    cdef public dict sym_table
+    cdef public dict const_table
+
+    cpdef Py_ssize_t _add_sym(self, name)
+    cpdef Py_ssize_t _add_const(self, val)
+
+    @cython.locals(n=Py_ssize_t)
+    cpdef _emit(self, code, value, attr, line, col)
+
+    cpdef _char(self)
+    cpdef _peek(self, Py_ssize_t offset=*)
+    cpdef _advance(self)
+
+    @cython.locals(i=Py_ssize_t)
+    cpdef tuple _locate(self, Py_ssize_t pos)
+
+    @cython.locals(src=unicode, eol=Py_ssize_t, i=Py_ssize_t)
+    cpdef Py_ssize_t _find_in_line(self, target, Py_ssize_t pos)
+
+    @cython.locals(src=unicode, src_b=bytes, n=Py_ssize_t, pos=Py_ssize_t, end=Py_ssize_t,
+                   cls=Py_ssize_t, char_class=bytes)
+    cpdef _skip_trivia(self)
+
+    @cython.locals(pos=Py_ssize_t, start=Py_ssize_t, n=Py_ssize_t)
+    cpdef _scan_id(self)
+
+    @cython.locals(src=unicode, n=Py_ssize_t, pos=Py_ssize_t, start=Py_ssize_t, hex_start=Py_ssize_t)
+    cpdef _scan_hex(self, sl, sc)
+
+    @cython.locals(src=unicode, n=Py_ssize_t, pos=Py_ssize_t, start=Py_ssize_t)
+    cpdef _scan_octal(self, sl, sc)
+
+    @cython.locals(src=unicode, start=Py_ssize_t, end=Py_ssize_t, b=Py_ssize_t, cls=Py_ssize_t)
+    cpdef _scan_decimal(self, sl, sc)
+
+    @cython.locals(src=unicode, src_b=bytes, n=Py_ssize_t, pos=Py_ssize_t, b=Py_ssize_t, cls=Py_ssize_t,
+                   state=Py_ssize_t, nxt=Py_ssize_t, dfa=bytes, num_class=bytes)
+    cpdef _scan_decimal_part(self, Py_ssize_t start, sl, sc)
+
+    @cython.locals(src_b=bytes, pos=Py_ssize_t, end=Py_ssize_t, d=Py_ssize_t)
+    cpdef Py_ssize_t _scan_escape_digits(self, Py_ssize_t base, Py_ssize_t count, Py_ssize_t value)
+
+    @cython.locals(src=unicode, pos=Py_ssize_t, start=Py_ssize_t, run_start=Py_ssize_t, close=Py_ssize_t)
+    cpdef _scan_string(self)
+
+    @cython.locals(src=unicode, n=Py_ssize_t, pos=Py_ssize_t, start=Py_ssize_t,
+                   depth=Py_ssize_t, match_len=Py_ssize_t)
+    cpdef _scan_op(self)
+
+    @cython.locals(cls=Py_ssize_t, n=Py_ssize_t)
+    cpdef tokenize(self)
@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+import re
 import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
 
 # ==================== 词法单元定义 ====================
 
@@ -18,7 +22,8 @@ KEYWORDS = {
 # 运算符定义 - 按长度分组
 # [算法核心] 这里体现了 "最长匹配原则" (Longest Match Principle / Maximal Munch)。
 # 比如源代码是 ">>="，我们不应该识别为 ">" + ">=" 或者 ">>" + "="，而应该识别为 ">>="。
-# 实现策略：在扫描时，先尝试匹配 TRIPLE_OPS，失败再试 DOUBLE_OPS，最后试 SINGLE_OPS。
+# 实现策略：把所有运算符预先建成一棵按字符索引的前缀树 OP_TRIE (见下方)，
+# 扫描时沿树走到底，取最后一个可接受的节点，即最长匹配。
 SINGLE_OPS = {'+', '-', '*', '/', '%', '=', '&', '|', '^', '~', '!', '<', '>'}
 DOUBLE_OPS = {'++', '--', '+=', '-=', '*=', '/=', '%=', '&&', '||',
               '<<', '>>', '&=', '|=', '^=', '<=', '>=', '<>', '==', '!=', '->'}
@@ -69,6 +74,18 @@ CODE = {
     ';': 136, '#': 137, ',': 138, ':': 139, '.': 140,
 }
 
+# 关键字 -> 种别码，识别标识符后只需一次 dict 查找即可同时完成判定和取码
+KW_CODE = {kw: CODE[kw] for kw in KEYWORDS}
+
+# 按长度分桶的关键字表：_KW_BY_LEN[n] 是所有长度为 n 的关键字 -> 种别码，没有则为 None。
+# [性能] 绝大多数标识符不是关键字，长度也常常对不上任何关键字 (比如超过 8 个字符)，
+# 这时只需一次 len() 和一次元组下标就能排除，连哈希都不用算。
+_KW_MAX_LEN = max(len(kw) for kw in KEYWORDS)
+_KW_BY_LEN = tuple(
+    {kw: code for kw, code in KW_CODE.items() if len(kw) == n} or None
+    for n in range(_KW_MAX_LEN + 1)
+)
+
 # 转义字符映射表
 # [功能说明] 用于将源代码中的转义序列（如字符 'n'）映射为实际的控制字符（如换行符 '\n'）。
 # 在处理字符串 "hello\nworld" 时，扫描器读到 '\' 后会查这个表。
@@ -78,6 +95,147 @@ ESCAPE_CHARS = {
     'b': '\b', 'f': '\f', 'v': '\v'
 }
 
+# 转义数字值表
+# [性能] 按 ASCII 码直接查出 \x41、\101 中每一位的数值 ('0'-'9' -> 0-9，'a'-'f'/'A'-'F' -> 10-15，其余 255)，
+# 代替切片后调用 int(..., 16) / int(..., 8)。值 < 8 即为八进制位，< 16 即为十六进制位。
+_DIGIT_VAL = bytes(
+    int(chr(i), 16) if chr(i) in '0123456789abcdefABCDEF' else 255
+    for i in range(256)
+)
+
+
+# 运算符前缀树
+# [性能] 扫描运算符时沿树逐字符向下走，代替 "拼出三字符/双字符串再查 set" 的做法。
+def _build_op_trie(ops):
+    """
+    构建运算符前缀树 (Trie)
+    每个节点是一个 dict：字符 -> 子节点；若从根到该节点的路径本身是一个运算符，
+    则节点中额外存放键 '' -> 种别码。例如 '<' 节点形如
+    {'': 110, '<': {'': 84, '=': {'': 89}}, '=': {'': 112}, '>': {'': 114}}
+    """
+    trie = {}
+    for op in ops:
+        node = trie
+        for ch in op:
+            node = node.setdefault(ch, {})
+        node[''] = CODE[op]
+    return trie
+
+
+OP_TRIE = _build_op_trie(SINGLE_OPS | DOUBLE_OPS | TRIPLE_OPS)
+
+
+# 空白字符集合 (空格、Tab、回车、换行)
+_WS_SET = frozenset(' \t\r\n')
+
+# 字符分类表 (Character Class Table)
+# [性能] 主循环对每个单词的首字符都要判断类别。逐个调用 isalpha()/isdigit()
+# 再到多个 set 里查找开销不小，所以在模块加载时为全部 ASCII 字符预先算好类别，
+# 运行时只需 CHAR_CLASS[ord(ch)] 一次下标访问 (扫描器中直接用 Lexer.src_b[pos])。
+# 非 ASCII 字符一律归为 CLS_OTHER，由主循环再按 Unicode 规则细分。
+CLS_OTHER = 0    # 非法字符 / 非 ASCII 字符
+CLS_IDENT = 1    # 字母、下划线 (标识符首字符)
+CLS_DIGIT = 2    # 数字
+CLS_OP = 3       # 运算符首字符 (/ 除外)
+CLS_DELIM = 4    # 界限符 (. 除外)
+CLS_SQUOTE = 5   # '
+CLS_DQUOTE = 6   # "
+CLS_DOT = 7      # . (可能是界限符，也可能是 .5 这种浮点数的开头)
+CLS_WS = 8       # 空白字符
+CLS_SLASH = 9    # / (可能是除号，也可能是注释的开头)
+
+
+def _build_char_class():
+    table = bytearray(256)
+    for c in range(128):
+        ch = chr(c)
+        if ch.isalpha() or ch == '_':
+            table[c] = CLS_IDENT
+        elif ch.isdigit():
+            table[c] = CLS_DIGIT
+        elif ch in SINGLE_OPS:
+            table[c] = CLS_OP
+        elif ch in DELIMITERS:
+            table[c] = CLS_DELIM
+        elif ch in _WS_SET:
+            table[c] = CLS_WS
+    table[ord("'")] = CLS_SQUOTE
+    table[ord('"')] = CLS_DQUOTE
+    table[ord('.')] = CLS_DOT
+    table[ord('/')] = CLS_SLASH
+    return bytes(table)
+
+
+CHAR_CLASS = _build_char_class()
+
+# Lexer.src_b 中非 ASCII 字符的占位字节，即 '?'
+# 扫描器遇到这个字节时 (它也可能就是源码里真正的 '?')，需要回到 src 中查看实际字符。
+_PLACEHOLDER = ord('?')
+
+# 预编译正则：用于一次吃掉一整段同类字符
+# [性能] 逐字符的循环交给 C 实现的 re 引擎完成，Python 层每个单词只调用一次 match。
+# - \w 与 "str.isalnum() 或 '_'" 的判定完全一致 (包括中文等 Unicode 字母)。
+# - 数字只写 ASCII 的 [0-9]：\d 与 str.isdigit() 对 '²' 这类字符判定不同，
+#   所以正则停下的位置若是非 ASCII 字符，扫描器仍按 isdigit() 再判断一次。
+_RE_ID = re.compile(r'\w+')
+_RE_HEX = re.compile(r'[0-9a-fA-F]*')
+_RE_DIGITS = re.compile(r'[0-9]*')
+_RE_STR_RUN = re.compile(r'[^"\\\n]*')
+# 十进制数的常见形状：整数、小数 (1.5 / 1.)、指数 (1e10 / 1.5E-3)。分组 1、2 任一匹配即为浮点数。
+_RE_NUMBER = re.compile(r'[0-9]+(\.[0-9]*)?([eE][+-]?[0-9]+)?')
+
+# 十进制数 / 浮点数的 DFA (确定有限自动机)
+# [设计说明] 形如 123、1.5、.5、1.、1e10、1.5E-3 的数字，用一张状态转移表描述：
+#   NS_INT --数字--> NS_INT --.--> NS_DOT --数字--> NS_FRAC --e/E--> NS_E --+/- --> NS_ESIGN --数字--> NS_EXP
+# (NS_INT / NS_DOT / NS_FRAC 也可以直接经 e/E 进入 NS_E，NS_E 也可以直接读数字进入 NS_EXP)
+# 表中没有的转移即 NS_REJECT，表示数字到此结束。
+# 可接受的终止状态：NS_INT (整数)、NS_DOT / NS_FRAC / NS_EXP (浮点数)；
+# 停在 NS_E / NS_ESIGN 说明指数部分缺少数字。
+NS_INT = 0      # 整数部分
+NS_DOT = 1      # 刚读入小数点
+NS_FRAC = 2     # 小数部分
+NS_E = 3        # 刚读入 e/E
+NS_ESIGN = 4    # 刚读入指数的正负号
+NS_EXP = 5      # 指数部分
+NS_REJECT = 255
+
+# DFA 的输入字符类别
+NC_OTHER = 0    # 其他字符
+NC_DIGIT = 1    # 数字
+NC_DOT = 2      # .
+NC_E = 3        # e / E
+NC_SIGN = 4     # + / -
+NUM_NCLS = 5
+
+
+def _build_num_dfa():
+    """构建扁平的转移表：NUM_DFA[state * NUM_NCLS + cls] -> 下一状态"""
+    table = bytearray([NS_REJECT]) * (6 * NUM_NCLS)
+    edges = [
+        (NS_INT, NC_DIGIT, NS_INT), (NS_INT, NC_DOT, NS_DOT), (NS_INT, NC_E, NS_E),
+        (NS_DOT, NC_DIGIT, NS_FRAC), (NS_DOT, NC_E, NS_E),
+        (NS_FRAC, NC_DIGIT, NS_FRAC), (NS_FRAC, NC_E, NS_E),
+        (NS_E, NC_DIGIT, NS_EXP), (NS_E, NC_SIGN, NS_ESIGN),
+        (NS_ESIGN, NC_DIGIT, NS_EXP),
+        (NS_EXP, NC_DIGIT, NS_EXP),
+    ]
+    for state, cls, nxt in edges:
+        table[state * NUM_NCLS + cls] = nxt
+    return bytes(table)
+
+
+NUM_DFA = _build_num_dfa()
+
+# ASCII 字符 -> DFA 输入类别 (非 ASCII 字符在扫描时按 isdigit() 判断)
+_NUM_CLASS = bytes(
+    NC_DIGIT if chr(c).isdigit() else
+    NC_DOT if chr(c) == '.' else
+    NC_E if chr(c) in 'eE' else
+    NC_SIGN if chr(c) in '+-' else
+    NC_OTHER
+    for c in range(128)
+)
+
 
 class Token:
     """
@@ -99,6 +257,36 @@ class Token:
         return f"({self.code}, '{self.value}', {self.attr})"
 
 
+class TokenList(Sequence):
+    """
+    Token 序列 (只读视图)
+    Lexer 内部按列存储 Token，这个类把各列包装成 "Token 对象列表" 的样子：
+    支持 len()、下标、切片和 for 循环，访问到哪个 Token 才临时构造哪个 Token 对象。
+    """
+
+    def __init__(self, lexer):
+        self._lexer = lexer
+
+    def __len__(self):
+        return self._lexer._ntok
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._lexer.token(j) for j in range(*i.indices(len(self)))]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('token index out of range')
+        return self._lexer.token(i)
+
+    def __iter__(self):
+        return map(self._lexer.token, range(len(self)))
+
+    def __repr__(self):
+        return repr(list(self))
+
+
 class LexError:
     """
     词法错误类
@@ -146,27 +334,90 @@ class Lexer:
 
     def __init__(self, source):
         self.src = source          # 源代码字符串
+        # [ASCII 字节视图] 与 src 逐字符对齐的 bytes：ASCII 字符原样保留，其余字符替换为 '?'。
+        # bytes 的下标访问直接得到整数，可以直接去查 CHAR_CLASS 等表，省掉 ord() 和 "是否 ASCII" 的判断。
+        # 值的切片、正则和 find 仍然在 src 上进行。
+        self.src_b = source.encode('ascii', 'replace')
         self.pos = 0               # [指针] 当前扫描到的字符索引
-        self.line = 1              # [计数器] 当前行号 (遇到 \n 加 1)
-        self.col = 1               # [计数器] 当前列号 (每读一个字符 加 1，换行归 1)
-        self.tokens = []           # [输出] 最终生成的 Token 列表
+        # [行首表] 每一行第一个字符的下标。扫描时只移动 pos，不逐字符维护行号/列号，
+        # 需要 (行, 列) 时再由 _locate(pos) 二分查找换算。
+        self.line_starts = [0]
+        nl = source.find('\n')
+        while nl != -1:
+            self.line_starts.append(nl + 1)
+            nl = source.find('\n', nl + 1)
+        # [输出] Token 序列，按列存储 (Struct of Arrays)：
+        # 第 i 个 Token 的各字段分别是 tok_code[i]、tok_value[i]、tok_attr[i]、tok_line[i]、tok_col[i]。
+        # 与 "每个 Token 一个对象" 相比，整数字段紧凑地存放在 array 中，内存占用小得多。
+        # [预分配] 按 "约每 4 个字符一个 Token" 预先开好各列，_emit 按下标写入，省掉逐个追加时的反复扩容；
+        # 实际 Token 数记在 _ntok 中，tokenize 结束时截掉多余的部分。
+        cap = len(source) // 4 + 16
+        self._ntok = 0
+        self.tok_code = array('i', [0]) * cap    # 种别码
+        self.tok_value = [None] * cap            # 单词值
+        self.tok_attr = array('i', [0]) * cap    # 符号表/常量表下标，-1 表示没有属性值 ('-')
+        self.tok_line = array('i', [0]) * cap    # 行号
+        self.tok_col = array('i', [0]) * cap     # 列号
+        self.tokens = TokenList(self)  # 以 Token 对象形式访问的只读视图，用法同原来的 Token 列表
         self.errors = []           # [输出] 发现的词法错误列表
-        self.sym_table = []        # [符号表] 存储所有识别出的标识符 (去重)
-        self.const_table = []      # [常量表] 存储所有识别出的常量 (去重)
+        self.sym_table = {}        # [符号表] 标识符 -> 下标 (去重；dict 保持插入顺序)
+        self.const_table = {}      # [常量表] 常量 -> 下标 (去重；dict 保持插入顺序)
 
     # ---------- 符号表/常量表操作 ----------
 
     def _add_sym(self, name):
-        """添加标识符到符号表，返回索引"""
-        if name not in self.sym_table:
-            self.sym_table.append(name)
-        return self.sym_table.index(name)
+        """
+        添加标识符到符号表，返回索引
+        [性能] 符号表本身就是 dict，查重取下标都是 O(1)，代替 list 的 in + index() (O(n))。
+        Python 3.7+ 的 dict 保持插入顺序，所以按顺序遍历键就是按下标排列的标识符。
+        """
+        idx = self.sym_table.get(name)
+        if idx is None:
+            idx = len(self.sym_table)
+            self.sym_table[name] = idx
+        return idx
 
     def _add_const(self, val):
-        """添加常量到常量表，返回索引"""
-        if val not in self.const_table:
-            self.const_table.append(val)
-        return self.const_table.index(val)
+        """添加常量到常量表，返回索引 (同 _add_sym)"""
+        idx = self.const_table.get(val)
+        if idx is None:
+            idx = len(self.const_table)
+            self.const_table[val] = idx
+        return idx
+
+    # ---------- Token 输出 ----------
+
+    def _emit(self, code, value, attr, line, col):
+        """输出一个 Token：各字段分别写入对应的列。attr 为符号表/常量表下标，-1 表示无"""
+        n = self._ntok
+        if n < len(self.tok_value):  # 预分配的空间内直接按下标写入
+            self.tok_code[n] = code
+            self.tok_value[n] = value
+            self.tok_attr[n] = attr
+            self.tok_line[n] = line
+            self.tok_col[n] = col
+        else:  # 预估偏小 (Token 特别密集) 时退回追加
+            self.tok_code.append(code)
+            self.tok_value.append(value)
+            self.tok_attr.append(attr)
+            self.tok_line.append(line)
+            self.tok_col.append(col)
+        self._ntok = n + 1
+
+    def token(self, i):
+        """
+        取第 i 个 Token，临时构造成 Token 对象返回
+        属性值在这里才格式化：标识符为 'SYM:n'，常量为 'CONST:n'，其余为 '-'。
+        """
+        code = self.tok_code[i]
+        idx = self.tok_attr[i]
+        if idx < 0:
+            attr = '-'
+        elif code == CODE['ID']:
+            attr = f'SYM:{idx}'
+        else:
+            attr = f'CONST:{idx}'
+        return Token(code, self.tok_value[i], attr, self.tok_line[i], self.tok_col[i])
 
     # ---------- 字符读取 ----------
 
@@ -188,57 +439,72 @@ class Lexer:
         """
         [辅助函数] 前进 (Consume)
         返回当前字符，并将指针 pos 向后移动一位。
-        同时负责维护 line (行号) 和 col (列号) 的更新。
+        (行号、列号不在这里维护，见 _locate)
         """
         ch = self._char()
         if ch:
             self.pos += 1
-            if ch == '\n':
-                self.line += 1
-                self.col = 1
-            else:
-                self.col += 1
         return ch
 
-    # ---------- 跳过空白和注释 ----------
-
-    def _skip_ws(self):
-        """跳过空白字符"""
-        while self._char() in ' \t\r\n':
-            self._advance()
+    def _locate(self, pos):
+        """
+        [辅助函数] 定位
+        把源码下标 pos 换算成 (行号, 列号)，均从 1 开始。
+        在行首表 line_starts 中二分查找 pos 所在的行，只在输出 Token 或报错时调用。
+        """
+        i = bisect_right(self.line_starts, pos) - 1
+        return i + 1, pos - self.line_starts[i] + 1
 
-    def _skip_comment(self):
+    def _find_in_line(self, target, pos):
         """
-        [扫描逻辑] 跳过注释
-        支持两种注释风格：
-        1. 单行注释 // ... (直到行尾)
-        2. 多行注释 /* ... */ (直到遇到 */)
+        [辅助函数] 在本行内查找字符 target
+        从 pos 开始查找，返回 target 的下标；本行内找不到则返回行尾
+        (换行符的下标，或源码末尾 len(src))。
+        [性能] 用 str.find 在 C 层面完成查找，代替逐字符的 while 循环。
         """
-        if self._char() != '/':
-            return False
+        src = self.src
+        eol = src.find('\n', pos)
+        if eol == -1:
+            eol = len(src)
+        i = src.find(target, pos, eol)
+        return eol if i == -1 else i
 
-        # 单行注释 //
-        if self._peek() == '/':
-            while self._char() and self._char() != '\n':
-                self._advance()
-            return True
-
-        # 多行注释 /* */
-        if self._peek() == '*':
-            sl, sc = self.line, self.col  # 记录开始位置，用于报错
-            self._advance()  # 跳 /
-            self._advance()  # 跳 *
-            while self._char():
-                if self._char() == '*' and self._peek() == '/':
-                    self._advance()
-                    self._advance()
-                    return True
-                self._advance()
-            # 没找到*/，注释未闭合
-            self.errors.append(LexError('UNCLOSED_COMMENT', sl, sc, "/*"))
-            return True
+    # ---------- 跳过空白和注释 ----------
 
-        return False
+    def _skip_trivia(self):
+        """
+        [扫描逻辑] 跳过空白和注释
+        一次循环连续跳过任意多段空白字符、单行注释 // ... 和多行注释 /* ... */，
+        停在下一个有意义的字符上。
+        [性能] 注释的结尾用 str.find 直接定位 (C 实现的子串查找)，不逐字符扫描注释内容。
+        """
+        src = self.src
+        src_b = self.src_b
+        n = len(src)
+        pos = self.pos
+        char_class = CHAR_CLASS
+        while pos < n:
+            cls = char_class[src_b[pos]]
+            if cls == CLS_WS:
+                pos += 1
+            elif cls == CLS_SLASH and pos + 1 < n and src[pos + 1] == '/':
+                # 单行注释 //：跳到行尾的换行符 (换行符本身按空白处理)
+                pos = src.find('\n', pos + 2)
+                if pos == -1:
+                    pos = n
+            elif cls == CLS_SLASH and pos + 1 < n and src[pos + 1] == '*':
+                # 多行注释 /* */
+                end = src.find('*/', pos + 2)
+                if end == -1:
+                    # 没找到*/，注释未闭合
+                    sl, sc = self._locate(pos)
+                    self.errors.append(LexError('UNCLOSED_COMMENT', sl, sc, "/*"))
+                    pos = n
+                else:
+                    pos = end + 2
+            else:
+                break
+        self.pos = pos
 
     # ---------- 扫描标识符/关键字 ----------
 
@@ -253,28 +519,42 @@ class Lexer:
            - 如果在表中 -> 它是关键字 (如 if, while)
            - 如果不在表中 -> 它是用户定义的标识符 (如 count, main)
         """
-        sl, sc = self.line, self.col  # 记录单词开始的位置
-        val = ''
+        sl, sc = self._locate(self.pos)  # 记录单词开始的位置
+        start = self.pos
 
-        # 循环读取后续的合法字符 (字母、数字、下划线)
-        while self._char() and (self._char().isalnum() or self._char() == '_'):
-            val += self._advance()
+        # 读取后续的合法字符 (字母、数字、下划线)，由正则一次匹配完
+        # [性能] 只移动指针，扫描结束后一次性切片取值，避免 val += ch 反复创建新字符串
+        pos = _RE_ID.match(self.src, start).end()
+        self.pos = pos
+        val = self.src[start:pos]
 
         # 查表区分关键字和标识符
-        if val.lower() in KEYWORDS:
+        # 先按长度找到对应的关键字桶，长度对不上的直接当作标识符。
+        # 关键字不区分大小写 (IF 同 if)。常见情况下原样查一次即可，
+        # 只有含大写字母等情况才需要 lower() 后再查一次。
+        n = len(val)
+        kw = _KW_BY_LEN[n] if n <= _KW_MAX_LEN else None
+        code = None
+        if kw is not None:
+            code = kw.get(val)
+            if code is None and not val.islower():
+                code = kw.get(val.lower())
+        if code is not None:
             # 是关键字：返回对应的种别码，属性值为 '-'
-            return Token(CODE[val.lower()], val, '-', sl, sc)
+            self._emit(code, val, -1, sl, sc)
+            return
 
         # 是标识符：加入符号表，属性值为符号表索引 'SYM:n'
         idx = self._add_sym(val)
-        return Token(CODE['ID'], val, f'SYM:{idx}', sl, sc)
+        self._emit(CODE['ID'], val, idx, sl, sc)
 
     def _scan_illegal_id(self):
         """扫描以数字开头的非法标识符，如1abc"""
-        sl, sc = self.line, self.col
-        val = ''
+        sl, sc = self._locate(self.pos)
+        start = self.pos
         while self._char() and (self._char().isalnum() or self._char() == '_'):
-            val += self._advance()
+            self._advance()
+        val = self.src[start:self.pos]
         self.errors.append(LexError('ILLEGAL_ID', sl, sc, val, "标识符不能以数字开头"))
         return None
 
@@ -291,7 +571,7 @@ class Lexer:
            - 否则 -> 可能是 0 本身，或者 0.123 (浮点数)，转交给 _scan_decimal
         2. 如果以 1-9 开头 -> 是十进制或浮点数，转交给 _scan_decimal
         """
-        sl, sc = self.line, self.col
+        sl, sc = self._locate(self.pos)
 
         # 检查前缀来决定数字类型
         if self._char() == '0':
@@ -305,137 +585,198 @@ class Lexer:
 
     def _scan_hex(self, sl, sc):
         """扫描十六进制数 0x1F"""
-        val = self._advance() + self._advance()  # 读0x
-        hex_digits = ''
-
-        while self._char() and (self._char().isdigit() or self._char().lower() in 'abcdef'):
-            hex_digits += self._advance()
-
-        if not hex_digits:
+        start = self.pos
+        self._advance()  # 读0
+        self._advance()  # 读x
+        hex_start = self.pos
+
+        src = self.src
+        n = len(src)
+        pos = _RE_HEX.match(src, hex_start).end()
+        while pos < n and src[pos].isdigit():  # 正则只认 ASCII，'²' 这类数字在这里补上
+            pos = _RE_HEX.match(src, pos + 1).end()
+        self.pos = pos
+
+        if self.pos == hex_start:
             # 0x后面没有合法数字
             if self._char() and self._char().isalpha():
                 while self._char() and (self._char().isalnum() or self._char() == '_'):
-                    hex_digits += self._advance()
-                self.errors.append(LexError('ILLEGAL_HEX', sl, sc, val + hex_digits, "包含非法字符"))
+                    self._advance()
+                self.errors.append(LexError('ILLEGAL_HEX', sl, sc, self.src[start:self.pos], "包含非法字符"))
             else:
-                self.errors.append(LexError('ILLEGAL_HEX', sl, sc, val, "缺少十六进制数字"))
+                self.errors.append(LexError('ILLEGAL_HEX', sl, sc, self.src[start:self.pos], "缺少十六进制数字"))
             return None
 
-        val += hex_digits
+        val = self.src[start:self.pos]
         idx = self._add_const(val)
-        return Token(CODE['HEX'], val, f'CONST:{idx}', sl, sc)
+        self._emit(CODE['HEX'], val, idx, sl, sc)
 
     def _scan_octal(self, sl, sc):
         """扫描八进制数 07"""
-        val = self._advance()  # 读开头的0
+        start = self.pos
+        self._advance()  # 读开头的0
 
-        while self._char() and self._char().isdigit():
-            if self._char() in '89':  # 八进制不能有8和9
-                while self._char() and self._char().isdigit():
-                    val += self._advance()
-                self.errors.append(LexError('ILLEGAL_OCT', sl, sc, val, "八进制数不能包含8或9"))
-                return None
-            val += self._advance()
+        src = self.src
+        n = len(src)
+        pos = self.pos
+        while pos < n and src[pos].isdigit() and src[pos] not in '89':
+            pos += 1
+        self.pos = pos
+
+        if self._char() in ('8', '9'):  # 八进制不能有8和9
+            while self._char() and self._char().isdigit():
+                self._advance()
+            self.errors.append(LexError('ILLEGAL_OCT', sl, sc, self.src[start:self.pos], "八进制数不能包含8或9"))
+            return None
 
         # 后面跟字母是非法的
         if self._char() and self._char().isalpha():
             while self._char() and (self._char().isalnum() or self._char() == '_'):
-                val += self._advance()
-            self.errors.append(LexError('ILLEGAL_NUMBER', sl, sc, val))
+                self._advance()
+            self.errors.append(LexError('ILLEGAL_NUMBER', sl, sc, self.src[start:self.pos]))
             return None
 
         # 可能是0.5这样的浮点数
         if self._char() == '.' and self._peek() and self._peek().isdigit():
-            return self._scan_decimal_part(val, sl, sc)
+            return self._scan_decimal_part(start, sl, sc)
 
+        val = self.src[start:self.pos]
         idx = self._add_const(val)
-        return Token(CODE['OCT'], val, f'CONST:{idx}', sl, sc)
+        self._emit(CODE['OCT'], val, idx, sl, sc)
 
     def _scan_decimal(self, sl, sc):
-        """扫描十进制整数部分"""
-        val = ''
-        while self._char() and self._char().isdigit():
-            val += self._advance()
-        return self._scan_decimal_part(val, sl, sc)
-
-    def _scan_decimal_part(self, int_part, sl, sc):
-        """扫描小数部分和指数部分"""
-        val = int_part
-        has_dot = False
-        has_exp = False
-
-        # 小数部分
-        if self._char() == '.':
-            if self._peek() == '.':  # 是..运算符，不是小数点
-                if val:
-                    idx = self._add_const(val)
-                    return Token(CODE['INT'], val, f'CONST:{idx}', sl, sc)
-                return None
-
-            has_dot = True
-            val += self._advance()  # 读小数点
+        """
+        扫描十进制数
+        [性能] 先用 _RE_NUMBER 按 "整数 / 小数 / 指数" 的常见形状一次匹配完，由匹配到的分组直接
+        决定是 INT 还是 FLOAT；只要数字后面紧跟的字符不会引起歧义或错误，就直接输出，不进入 DFA。
+        其余情况 (如 1..、1.2.3、1e、12abc、非 ASCII 数字) 交给 _scan_decimal_part 的 DFA 逐字符处理。
+        """
+        src = self.src
+        start = self.pos
+        m = _RE_NUMBER.match(src, start)
+        if m is None:
+            # 首字符是非 ASCII 数字 (isdigit 为真，如 '²')
+            return self._scan_decimal_part(start, sl, sc)
+        end = m.end()
+        if end < len(src):
+            b = self.src_b[end]
+            cls = CHAR_CLASS[b]
+            if cls == CLS_IDENT or cls == CLS_DOT or b == _PLACEHOLDER:
+                return self._scan_decimal_part(start, sl, sc)
+
+        self.pos = end
+        val = src[start:end]
+        idx = self._add_const(val)
+        code = CODE['INT'] if m.lastindex is None else CODE['FLOAT']
+        self._emit(code, val, idx, sl, sc)
 
-            frac_digits = ''
-            while self._char() and self._char().isdigit():
-                frac_digits += self._advance()
+    def _scan_decimal_part(self, start, sl, sc):
+        """
+        扫描十进制数的剩余部分 (整数、小数、指数)
+        start 是整个数字在源码中的起始下标，[start, pos) 是调用者已读入的部分
+        (八进制前缀 "0"、或为空)。
 
-            if not frac_digits and not int_part:
-                self.errors.append(LexError('ILLEGAL_FLOAT', sl, sc, val, "缺少数字"))
-                return None
-            val += frac_digits
-
-            # 不能有两个小数点
-            if self._char() == '.':
-                extra = ''
-                while self._char() and (self._char().isdigit() or self._char() == '.'):
-                    extra += self._advance()
-                self.errors.append(LexError('ILLEGAL_FLOAT', sl, sc, val + extra, "多个小数点"))
+        [实现] 由 NUM_DFA 驱动：每读一个字符查一次 (状态, 字符类别) -> 下一状态，
+        直到遇到 NS_REJECT。扫描停下后，根据停在哪个状态、停在哪个字符上，
+        决定是合法数字还是哪一种错误。
+        """
+        src = self.src
+        src_b = self.src_b
+        n = len(src)
+        pos = self.pos
+        dfa = NUM_DFA
+        num_class = _NUM_CLASS
+        digits_match = _RE_DIGITS.match
+        state = NS_INT
+
+        while pos < n:
+            b = src_b[pos]
+            if b == _PLACEHOLDER:  # 非 ASCII 字符 (或 '?' 本身)：按 isdigit() 判断
+                cls = NC_DIGIT if src[pos].isdigit() else NC_OTHER
+            else:
+                cls = num_class[b]
+            nxt = dfa[state * NUM_NCLS + cls]
+            if nxt == NS_REJECT:
+                break
+            state = nxt
+            pos += 1
+            if cls == NC_DIGIT:  # 数字之后的状态都在数字上自环，连续的 ASCII 数字交给正则一次跳过
+                pos = digits_match(src, pos).end()
+
+        if state == NS_DOT and pos < n and src[pos] == '.':
+            # 是..运算符，不是小数点：退回到第一个点之前，只取整数部分
+            pos -= 1
+            if pos == start:
                 return None
+            self.pos = pos
+            val = src[start:pos]
+            idx = self._add_const(val)
+            self._emit(CODE['INT'], val, idx, sl, sc)
+            return
 
-        # 科学计数法 e/E
-        if self._char() and self._char().lower() == 'e':
-            has_exp = True
-            val += self._advance()
+        self.pos = pos
 
-            if self._char() in ('+', '-'):  # 可选的正负号
-                val += self._advance()
+        if state == NS_DOT and pos - 1 == start:  # 只有一个孤立的小数点
+            self.errors.append(LexError('ILLEGAL_FLOAT', sl, sc, src[start:pos], "缺少数字"))
+            return None
 
-            exp_digits = ''
-            while self._char() and self._char().isdigit():
-                exp_digits += self._advance()
+        # 不能有两个小数点
+        if state == NS_FRAC and self._char() == '.':
+            while self._char() and (self._char().isdigit() or self._char() == '.'):
+                self._advance()
+            self.errors.append(LexError('ILLEGAL_FLOAT', sl, sc, src[start:self.pos], "多个小数点"))
+            return None
 
-            if not exp_digits:
-                self.errors.append(LexError('ILLEGAL_FLOAT', sl, sc, val, "指数部分缺少数字"))
-                return None
-            val += exp_digits
+        # 科学计数法 e/E 后面缺少数字
+        if state == NS_E or state == NS_ESIGN:
+            self.errors.append(LexError('ILLEGAL_FLOAT', sl, sc, src[start:pos], "指数部分缺少数字"))
+            return None
 
         # 数字后不能直接跟字母
         if self._char() and (self._char().isalpha() or self._char() == '_'):
-            extra = ''
             while self._char() and (self._char().isalnum() or self._char() == '_'):
-                extra += self._advance()
-            self.errors.append(LexError('ILLEGAL_NUMBER', sl, sc, val + extra, "数字后不能直接跟字母"))
+                self._advance()
+            self.errors.append(LexError('ILLEGAL_NUMBER', sl, sc, src[start:self.pos], "数字后不能直接跟字母"))
             return None
 
+        val = src[start:pos]
         if not val:
             return None
 
         idx = self._add_const(val)
-        code = CODE['FLOAT'] if (has_dot or has_exp) else CODE['INT']
-        return Token(code, val, f'CONST:{idx}', sl, sc)
+        code = CODE['INT'] if state == NS_INT else CODE['FLOAT']
+        self._emit(code, val, idx, sl, sc)
 
     def _scan_leading_dot_number(self):
         """扫描.5这样的浮点数"""
-        sl, sc = self.line, self.col
+        sl, sc = self._locate(self.pos)
         if self._char() == '.' and self._peek() and self._peek().isdigit():
-            return self._scan_decimal_part('', sl, sc)
+            return self._scan_decimal_part(self.pos, sl, sc)
         return None
 
     # ---------- 扫描字符常量 ----------
 
+    def _scan_escape_digits(self, base, count, value):
+        """
+        [辅助函数] 读取转义序列中最多 count 个 base 进制的数字位 (\\x 后的十六进制位 / 八进制转义的后续位)
+        value 为已经读到的部分的值，返回读完后的值；每一位查 _DIGIT_VAL 表累加，不再调用 int()。
+        """
+        src_b = self.src_b
+        pos = self.pos
+        end = min(pos + count, len(src_b))
+        while pos < end:
+            d = _DIGIT_VAL[src_b[pos]]
+            if d >= base:
+                break
+            value = value * base + d
+            pos += 1
+        self.pos = pos
+        return value
+
     def _scan_char(self):
         """扫描字符常量 'a' '\\n' '\\x41'"""
-        sl, sc = self.line, self.col
+        sl, sc = self._locate(self.pos)
+        start = self.pos  # 开头 ' 的位置，[start, pos) 即目前读到的原始文本
         self._advance()  # 跳过开头的'
 
         if self._char() is None or self._char() == '\n':
@@ -448,121 +789,114 @@ class Lexer:
             return None
 
         char_val = ''
-        display_val = "'"
 
         if self._char() == '\\':  # 转义字符
-            display_val += self._advance()
+            self._advance()
             if self._char() is None:
-                self.errors.append(LexError('UNCLOSED_CHAR', sl, sc, display_val))
+                self.errors.append(LexError('UNCLOSED_CHAR', sl, sc, self.src[start:self.pos]))
                 return None
 
-            escape_char = self._char()
-            display_val += self._advance()
+            escape_char = self._advance()
 
             if escape_char == 'x':  # 十六进制转义 \x41
-                hex_val = ''
-                for _ in range(2):
-                    if self._char() and self._char().lower() in '0123456789abcdef':
-                        hex_val += self._advance()
-                        display_val += hex_val[-1]
-                if hex_val:
-                    char_val = chr(int(hex_val, 16))
+                hex_start = self.pos
+                code = self._scan_escape_digits(16, 2, 0)
+                if self.pos > hex_start:
+                    char_val = chr(code)
                 else:
-                    self.errors.append(LexError('ILLEGAL_ESCAPE', sl, sc, display_val))
-                    while self._char() and self._char() != "'" and self._char() != '\n':
-                        self._advance()
+                    self.errors.append(LexError('ILLEGAL_ESCAPE', sl, sc, self.src[start:self.pos]))
+                    self.pos = self._find_in_line("'", self.pos)
                     if self._char() == "'":
                         self._advance()
                     return None
             elif escape_char in ESCAPE_CHARS:
                 char_val = ESCAPE_CHARS[escape_char]
-            elif escape_char.isdigit():  # 八进制转义 \101
-                oct_val = escape_char
-                for _ in range(2):
-                    if self._char() and self._char().isdigit() and self._char() < '8':
-                        oct_val += self._advance()
-                        display_val += oct_val[-1]
-                char_val = chr(int(oct_val, 8))
+            elif '0' <= escape_char <= '7':  # 八进制转义 \101
+                char_val = chr(self._scan_escape_digits(8, 2, _DIGIT_VAL[ord(escape_char)]))
             else:
                 self.errors.append(LexError('ILLEGAL_ESCAPE', sl, sc, f"\\{escape_char}"))
                 char_val = escape_char
         else:  # 普通字符
-            char_val = self._char()
-            display_val += self._advance()
+            char_val = self._advance()
 
         # 检查多余字符
-        extra_chars = ''
-        while self._char() and self._char() != "'" and self._char() != '\n':
-            extra_chars += self._advance()
-            display_val += extra_chars[-1]
+        extra_start = self.pos
+        self.pos = self._find_in_line("'", extra_start)
+        has_extra = self.pos > extra_start
 
         if self._char() != "'":
-            self.errors.append(LexError('UNCLOSED_CHAR', sl, sc, display_val))
+            self.errors.append(LexError('UNCLOSED_CHAR', sl, sc, self.src[start:self.pos]))
             return None
 
-        display_val += self._advance()  # 读闭合的'
+        self._advance()  # 读闭合的'
+        display_val = self.src[start:self.pos]
 
-        if extra_chars:
+        if has_extra:
             self.errors.append(LexError('MULTI_CHAR', sl, sc, display_val))
             return None
 
         idx = self._add_const(display_val)
-        return Token(CODE['CHAR'], display_val, f'CONST:{idx}', sl, sc)
+        self._emit(CODE['CHAR'], display_val, idx, sl, sc)
 
     # ---------- 扫描字符串常量 ----------
 
     def _scan_string(self):
         """扫描字符串常量 "hello" """
-        sl, sc = self.line, self.col
+        sl, sc = self._locate(self.pos)
+        start = self.pos  # 开头 " 的位置，原始文本最后统一切片
         self._advance()  # 跳过开头的"
 
-        val = '"'
-        string_content = ''
+        # 快速路径：本行内能找到闭合的 "，且中间没有反斜杠 (不含转义)，整个字符串直接切片
+        src = self.src
+        close = self._find_in_line('"', self.pos)
+        if src.startswith('"', close) and src.find('\\', self.pos, close) == -1:
+            self.pos = close + 1
+            val = src[start:self.pos]
+            idx = self._add_const(val)
+            self._emit(CODE['STRING'], val, idx, sl, sc)
+            return None
+
+        # 解码后的内容按片段收集，最后 ''.join()，不在循环里做字符串 +=
+        content = []
 
         while self._char() and self._char() != '"' and self._char() != '\n':
             if self._char() == '\\':  # 转义
-                val += self._advance()
+                self._advance()
                 if self._char() is None or self._char() == '\n':
                     break
 
-                escape_char = self._char()
-                val += self._advance()
+                escape_char = self._advance()
 
                 if escape_char == 'x':
-                    hex_val = ''
-                    for _ in range(2):
-                        if self._char() and self._char().lower() in '0123456789abcdef':
-                            c = self._advance()
-                            hex_val += c
-                            val += c
-                    if hex_val:
-                        string_content += chr(int(hex_val, 16))
+                    hex_start = self.pos
+                    code = self._scan_escape_digits(16, 2, 0)
+                    if self.pos > hex_start:
+                        content.append(chr(code))
                     else:
                         self.errors.append(LexError('ILLEGAL_ESCAPE', sl, sc, "\\x"))
                 elif escape_char in ESCAPE_CHARS:
-                    string_content += ESCAPE_CHARS[escape_char]
-                elif escape_char.isdigit():
-                    oct_val = escape_char
-                    for _ in range(2):
-                        if self._char() and self._char().isdigit() and self._char() < '8':
-                            c = self._advance()
-                            oct_val += c
-                            val += c
-                    string_content += chr(int(oct_val, 8))
+                    content.append(ESCAPE_CHARS[escape_char])
+                elif '0' <= escape_char <= '7':
+                    content.append(chr(self._scan_escape_digits(8, 2, _DIGIT_VAL[ord(escape_char)])))
                 else:
                     self.errors.append(LexError('ILLEGAL_ESCAPE', sl, sc, f"\\{escape_char}"))
-                    string_content += escape_char
+                    content.append(escape_char)
             else:
-                string_content += self._char()
-                val += self._advance()
+                # 一段不含转义的普通字符，整段切片
+                run_start = self.pos
+                pos = _RE_STR_RUN.match(self.src, run_start).end()
+                self.pos = pos
+                content.append(self.src[run_start:pos])
 
         if self._char() != '"':
-            self.errors.append(LexError('UNCLOSED_STRING', sl, sc, val))
+            self.errors.append(LexError('UNCLOSED_STRING', sl, sc, self.src[start:self.pos]))
             return None
 
-        val += self._advance()
+        self._advance()
+        string_content = ''.join(content)  # 解码后的字符串值
+        val = self.src[start:self.pos]
         idx = self._add_const(val)
-        return Token(CODE['STRING'], val, f'CONST:{idx}', sl, sc)
+        self._emit(CODE['STRING'], val, idx, sl, sc)
 
     # ---------- 扫描运算符 ----------
 
@@ -573,48 +907,47 @@ class Lexer:
         核心算法：最长匹配原则 (Maximal Munch)
         我们必须尽可能多地匹配字符，以避免歧义。
         
+        实现：沿 OP_TRIE 逐字符向下走，记录最后一个可接受 (带种别码) 的深度。
         例子：对于序列 ">>="
-        1. 尝试匹配 3 个字符 ">>=" -> 成功！返回 ">>=" Token。
-        2. 如果失败，尝试匹配 2 个字符 ">>" -> 成功！返回 ">>" Token。
-        3. 如果失败，匹配 1 个字符 ">" -> 返回 ">" Token。
+        1. '>'  -> 节点可接受，记下长度 1
+        2. '>>' -> 节点可接受，记下长度 2
+        3. '>>=' -> 节点可接受，记下长度 3；再往下没有子节点，结束。
+        最终取最长的 ">>="。整个过程不拼接字符串，也不查 set。
         """
-        sl, sc = self.line, self.col
-        ch = self._char()
-
-        # 1. 尝试匹配三字符运算符 (如 <<=)
-        if self._peek() and self._peek(2):
-            three = ch + self._peek() + self._peek(2)
-            if three in TRIPLE_OPS:
-                self._advance() # 吃掉第1个
-                self._advance() # 吃掉第2个
-                self._advance() # 吃掉第3个
-                return Token(CODE[three], three, '-', sl, sc)
-
-        # 2. 尝试匹配双字符运算符 (如 ++, >=)
-        if self._peek():
-            two = ch + self._peek()
-            if two in DOUBLE_OPS:
-                self._advance() # 吃掉第1个
-                self._advance() # 吃掉第2个
-                return Token(CODE[two], two, '-', sl, sc)
-
-        # 3. 匹配单字符运算符 (如 +, -)
-        if ch in SINGLE_OPS:
-            self._advance() # 吃掉它
-            return Token(CODE[ch], ch, '-', sl, sc)
+        sl, sc = self._locate(self.pos)
+        src = self.src
+        n = len(src)
+        pos = self.pos
+
+        node = OP_TRIE.get(src[pos]) if pos < n else None
+        depth = 0
+        match_len = 0
+        code = None
+        while node is not None:
+            depth += 1
+            if '' in node:  # 走到这里的前缀本身就是一个运算符
+                match_len = depth
+                code = node['']
+            pos += 1
+            node = node.get(src[pos]) if pos < n else None
+
+        if not match_len:
+            return None
 
-        return None
+        start = self.pos
+        for _ in range(match_len):
+            self._advance()
+        self._emit(code, src[start:self.pos], -1, sl, sc)
 
     # ---------- 扫描界限符 ----------
 
     def _scan_delim(self):
         """扫描界限符"""
-        sl, sc = self.line, self.col
+        sl, sc = self._locate(self.pos)
         ch = self._char()
         if ch in DELIMITERS:
             self._advance()
-            return Token(CODE[ch], ch, '-', sl, sc)
-        return None
+            self._emit(CODE[ch], ch, -1, sl, sc)
 
     # ---------- 主循环 ----------
 
@@ -623,8 +956,8 @@ class Lexer:
         [主循环] 词法分析主控函数 (Driver Loop)
         
         流程：
-        1. 跳过空白字符 (空格、Tab、换行)。
-        2. 尝试跳过注释 (// 或 /* ... */)。
+        1. 跳过空白字符 (空格、Tab、换行)，
+        2. 以及注释 (// 或 /* ... */)，两者由 _skip_trivia 一次完成。
         3. 如果还有字符，读取当前首字符 (Lookahead char)。
         4. [分派逻辑] 根据首字符的类型，决定调用哪个扫描子程序：
            - 字母/_ -> _scan_id (标识符/关键字)
@@ -636,67 +969,58 @@ class Lexer:
         5. 循环直到文件结束。
         """
         while self.pos < len(self.src):
-            self._skip_ws()  # 步骤1: 过滤空白
-            if not self._char():
+            self._skip_trivia()  # 步骤1、2: 过滤空白和注释
+            if self.pos >= len(self.src):
                 break
-            if self._skip_comment():  # 步骤2: 过滤注释
-                continue
 
             ch = self._char()
-            sl, sc = self.line, self.col
 
             # 步骤4: 分派 (Dispatch)
-            if ch.isalpha() or ch == '_':  # 以字母或下划线开头 -> 标识符或关键字
-                self.tokens.append(self._scan_id())
-
-            elif ch.isdigit():  # 以数字开头 -> 数字常量
-                # [错误处理预判] 检查是否是 "123abc" 这种非法标识符
-                temp_pos = self.pos
-                while temp_pos < len(self.src) and (self.src[temp_pos].isalnum() or self.src[temp_pos] == '_'):
-                    temp_pos += 1
-                temp_val = self.src[self.pos:temp_pos]
-                has_letter = any(c.isalpha() for c in temp_val)
-                is_hex = temp_val.lower().startswith('0x')
-                is_exp = 'e' in temp_val.lower() and not any(c.isalpha() and c.lower() not in 'abcdefx' for c in temp_val)
-                if has_letter and not is_hex and not is_exp:
-                    pass # 这里其实可以优化，但为了保持逻辑简单，交给 _scan_num 内部去报错
-                tok = self._scan_num()
-                if tok:
-                    self.tokens.append(tok)
-
-            elif ch == '.' and self._peek() and self._peek().isdigit():  # 以点开头且后面是数字 -> 浮点数 (.5)
-                tok = self._scan_leading_dot_number()
-                if tok:
-                    self.tokens.append(tok)
-
-            elif ch == "'":  # 单引号 -> 字符常量
-                tok = self._scan_char()
-                if tok:
-                    self.tokens.append(tok)
-
-            elif ch == '"':  # 双引号 -> 字符串常量
-                tok = self._scan_string()
-                if tok:
-                    self.tokens.append(tok)
-
-            elif ch in SINGLE_OPS or (ch + (self._peek() or '')) in DOUBLE_OPS:  # 运算符
-                if ch == '/' and self._peek() in ('/', '*'):  # 注释 (虽然前面处理过，这里是双重保险)
-                    continue
-                tok = self._scan_op()
-                if tok:
-                    self.tokens.append(tok)
-
-            elif ch in DELIMITERS:  # 界限符
-                tok = self._scan_delim()
-                if tok:
-                    self.tokens.append(tok)
+            # 先查 ASCII 字符分类表得到类别，非 ASCII 字符再按 Unicode 规则补判
+            cls = CHAR_CLASS[self.src_b[self.pos]]
+            if cls == CLS_OTHER:
+                if ch.isalpha():
+                    cls = CLS_IDENT
+                elif ch.isdigit():
+                    cls = CLS_DIGIT
+
+            if cls == CLS_IDENT:  # 以字母或下划线开头 -> 标识符或关键字
+                self._scan_id()
+
+            elif cls == CLS_DIGIT:  # 以数字开头 -> 数字常量 ("123abc" 这类错误由 _scan_num 内部报告)
+                self._scan_num()
+
+            elif cls == CLS_OP:  # 运算符
+                self._scan_op()
+
+            elif cls == CLS_DELIM:  # 界限符
+                self._scan_delim()
                 if ch == '#':  # 约定 # 为程序结束符
                     break
 
+            elif cls == CLS_DOT:
+                if self._peek() and self._peek().isdigit():  # 以点开头且后面是数字 -> 浮点数 (.5)
+                    self._scan_leading_dot_number()
+                else:  # 否则是界限符 .
+                    self._scan_delim()
+
+            elif cls == CLS_SQUOTE:  # 单引号 -> 字符常量
+                self._scan_char()
+
+            elif cls == CLS_DQUOTE:  # 双引号 -> 字符串常量
+                self._scan_string()
+
+            elif cls == CLS_SLASH:  # 除号 / 或 /= (注释已由 _skip_trivia 跳过)
+                self._scan_op()
+
             else:  # 无法识别的字符 -> 报错并跳过
+                sl, sc = self._locate(self.pos)
                 self.errors.append(LexError('ILLEGAL_CHAR', sl, sc, ch))
                 self._advance()
 
+        # 截掉预分配但没有用到的部分
+        n = self._ntok
+        del self.tok_code[n:], self.tok_value[n:], self.tok_attr[n:], self.tok_line[n:], self.tok_col[n:]
         return self.tokens, self.errors
 
     # ---------- 输出结果 ----------
@@ -714,8 +1038,8 @@ class Lexer:
             print(f"{i:<5}{t.code:<8}{val_display:<15}{t.attr:<15}({t.line},{t.col})")
 
         print("\n" + "-" * 75)
-        print("标识符表:", self.sym_table if self.sym_table else "(空)")
-        print("常量表:  ", self.const_table if self.const_table else "(空)")
+        print("标识符表:", list(self.sym_table) if self.sym_table else "(空)")
+        print("常量表:  ", list(self.const_table) if self.const_table else "(空)")
 
         if self.errors:
             print("\n" + "=" * 75)
@@ -735,8 +1059,8 @@ class Lexer:
             f.write("-" * 60 + "\n")
             for i, t in enumerate(self.tokens, 1):
                 f.write(f"{i:3}. {t}\n")
-            f.write(f"\n标识符表: {self.sym_table}\n")
-            f.write(f"常量表:   {self.const_table}\n")
+            f.write(f"\n标识符表: {list(self.sym_table)}\n")
+            f.write(f"常量表:   {list(self.const_table)}\n")
             if self.errors:
                 f.write("\n" + "=" * 60 + "\n")
                 f.write(f"错误列表 ({len(self.errors)} 个):\n")
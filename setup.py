@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+可选：用 Cython 把 lexer.py 编译成 C 扩展模块以提升扫描速度。
+
+    pip install cython
+    python setup.py build_ext --inplace
+
+编译时会同时读取 lexer.pxd 中的类型声明。生成的 lexer.*.so 与 lexer.py 位于同一目录时，
+`import lexer` / `python -c "import lexer; ..."` 会优先加载编译后的扩展模块。
+没有安装 Cython 时不编译任何扩展，直接使用纯 Python 版本 (python lexer.py) 即可。
+"""
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize('lexer.py', compiler_directives={'language_level': 3})
+
+setup(
+    name='lexical-analyzer-lab',
+    py_modules=['lexer'],
+    ext_modules=ext_modules,
+)